@@ -0,0 +1,23 @@
+"""
+Optional Cython build of the server's game logic (src/battleship.py).
+
+    python3 setup.py build_ext --inplace
+
+The server runs unchanged without this step; startServer.sh attempts it when Cython is installed.
+"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name='battleship',
+    package_dir={'': 'src'}, # Build the extension in place next to src/battleship.py
+    ext_modules=cythonize(
+        ['src/battleship.py'],
+        compiler_directives={
+            'language_level': 3,
+            'boundscheck': False,
+            'wraparound': False,
+            'cdivision': True,
+        },
+    ),
+)
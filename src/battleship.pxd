@@ -0,0 +1,10 @@
+# Cython declarations applied to battleship.py when it is compiled (see setup.py).
+# Battleship becomes an extension type with C-level attribute storage; the bitboards
+# need 81 bits, more than any C integer type holds, so they stay Python ints.
+
+cdef class Battleship:
+    cdef public object ships_mask
+    cdef public object hits_mask
+    cdef public int shot_count
+
+    cpdef bint game_over(self)
@@ -0,0 +1,98 @@
+# Server-side game board and logic. Runs as plain Python, or can be compiled with Cython
+# (see setup.py and battleship.pxd); Python prefers the compiled extension when it is built.
+import itertools
+import random
+
+
+def build_placement_masks(grid_size):
+    """
+    Precompute the bitboard mask of every in-bounds ship placement, keyed by (x, y, size, direction)
+    """
+    masks = {}
+    for size in range(1, grid_size + 1):
+        for x in range(grid_size):
+            for y in range(grid_size):
+                bit = x * grid_size + y
+                if y + size <= grid_size:
+                    # Horizontal: 'size' contiguous bits along the row
+                    masks[x, y, size, 'H'] = ((1 << size) - 1) << bit
+                if x + size <= grid_size:
+                    # Vertical: one bit every 'grid_size' bits down the column
+                    masks[x, y, size, 'V'] = sum(1 << (bit + grid_size * i) for i in range(size))
+    return masks
+
+
+def group_placements_by_size(placement_masks):
+    """
+    Group placement masks (both directions) by ship size, as immutable tuples
+    """
+    by_size = {}
+    for (_, _, size, _), mask in placement_masks.items():
+        by_size.setdefault(size, []).append(mask)
+    return {size: tuple(masks) for size, masks in by_size.items()}
+
+
+class Battleship:
+    """
+    Class representing Battleship game board and game logic
+    """
+
+    GRID_SIZE = 9
+    ALPHABET = [chr(i) for i in range(65, 65 + GRID_SIZE)] # ['A', 'B', ...,'I']
+
+    # Lookup table from coordinate string (e.g., 'B7') to flat board index x * GRID_SIZE + y
+    COORD_TO_FLAT = {f'{c}{n}': i for i, (c, n) in enumerate(itertools.product(ALPHABET, range(1, GRID_SIZE + 1)))}
+    # Shot messages exactly as received on the wire (e.g., b'B7\n') mapped to flat index; doubles as the set of valid shots
+    SHOT_TO_FLAT = {f'{coord}\n'.encode(): i for coord, i in COORD_TO_FLAT.items()}
+
+    SHIP_SIZES = (
+        5, # Canberra-class Landing Helicopter Dock
+        4, # Hobart-class Destroyer
+        3, # Leeuwin-class Survey Vessel
+        2, # Armidale-class Patrol Boat
+    )
+    assert GRID_SIZE >= max(SHIP_SIZES) # Grid too small for largest ship
+
+    # Bitboard mask of every in-bounds placement, keyed by (x, y, size, direction) and grouped by size.
+    # Built once when the class is defined, so creating a game per connection costs only the placement itself
+    PLACEMENT_MASKS = build_placement_masks(GRID_SIZE)
+    PLACEMENTS_BY_SIZE = group_placements_by_size(PLACEMENT_MASKS)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Start a new game on this board: clear all shots and reposition the ships
+        """
+        self.ships_mask = 0  # Bitboard of cells occupied by ships (bit x * GRID_SIZE + y)
+        self.hits_mask = 0   # Bitboard of ship cells that have been hit
+        self.shot_count = 0  # Number of valid shots fired
+        self.position_ships()
+
+    def position_ships(self):
+        """
+        Randomnly position ships on board without overlapping. Each ship picks uniformly from
+        every placement that still fits, so no placement is ever drawn and rejected.
+        """
+        for size in self.SHIP_SIZES:
+            candidates = [mask for mask in self.PLACEMENTS_BY_SIZE[size] if not mask & self.ships_mask]
+            self.ships_mask |= random.choice(candidates)
+        
+    def game_over(self):
+        """
+        Return True if all ships have been sunk, i.e. every ship cell has been hit
+        """
+        return self.hits_mask == self.ships_mask
+
+    def fire(self, index):
+        """
+        Record a shot at the cell with the given flat index (see SHOT_TO_FLAT), marking it as hit
+        if it holds a ship. Return True for a new hit, False for a miss or an already hit cell
+        """
+        self.shot_count += 1
+        bit = 1 << index
+        if self.ships_mask & ~self.hits_mask & bit:
+            self.hits_mask |= bit
+            return True
+        return False
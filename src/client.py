@@ -1,10 +1,21 @@
 import socket
 import argparse
-import numpy as np
-import re
+import itertools
 import random
 import sys
 
+# Protocol messages, encoded once rather than on every send/compare
+START_GAME_MSG = b'START GAME\n'
+POSITIONING_SHIPS_MSG = b'POSITIONING SHIPS\n'
+SHIPS_IN_POSITION_MSG = b'SHIPS IN POSITION\n'
+HIT_MSG = b'HIT\n'
+MISS_MSG = b'MISS\n'
+MAX_MESSAGE_LENGTH = 64 # Longest message the client will buffer while waiting for a newline
+
+# Cell states stored in the client board
+EMPTY, HIT, MISS = 0, 1, 2
+GLYPH_TABLE = bytes.maketrans(bytes([EMPTY, HIT, MISS]), b'.XO') # Display character for each cell state
+
 class Battleship:
     """
     Class representing Battleship game board for client
@@ -12,11 +23,15 @@ class Battleship:
 
     GRID_SIZE = 9
     ALPHABET = [chr(i) for i in range(65, 65 + GRID_SIZE)] # ['A', 'B', ...,'I']
-    COORD_PATTERN = re.compile(r'^[A-I][1-9]$') # Valid coordinates: e.g., 'A1\n', 'E8\n'
+
+    # Lookup table from coordinate string (e.g., 'B7') to flat board index x * GRID_SIZE + y
+    COORD_TO_FLAT = {f'{c}{n}': i for i, (c, n) in enumerate(itertools.product(ALPHABET, range(1, GRID_SIZE + 1)))}
+    VALID_COORDS = frozenset(COORD_TO_FLAT) # Valid coordinates: e.g., 'A1', 'E8'
+    BOARD_HEADER = '  ' + ' '.join(ALPHABET) # Column headers A-I
 
     def __init__(self):
-        # Board initialisation: '.' indicates un unshot cell
-        self.board = np.full((self.GRID_SIZE, self.GRID_SIZE), '.', dtype=str)
+        # Board initialisation: one EMPTY byte per cell, indexed as board[x * GRID_SIZE + y]
+        self.board = bytearray(self.GRID_SIZE * self.GRID_SIZE)
         self.shot_count = 0   # Number of valid shots fired
         self.hit_count = 0    # Number of succesful shots
 
@@ -27,20 +42,21 @@ class Battleship:
         """
         Returns a string representation of the current board state
         """
-        rows = ['  ' + ' '.join(self.ALPHABET)] # Column headers A-I
+        glyphs = self.board.translate(GLYPH_TABLE).decode('ascii') # Every cell's glyph in a single C-level pass
+        rows = [self.BOARD_HEADER]
         for i in range(self.GRID_SIZE):
-            row = f"{i + 1} " + ' '.join(self.board[:, i]) # Each row with its number
-            rows.append(row)
+            # Every GRID_SIZE-th glyph from i is column i of every x, i.e. row i on screen
+            rows.append(f"{i + 1} " + ' '.join(glyphs[i::self.GRID_SIZE])) # Each row with its number
         return '\n'.join(rows) + '\n'
     
 
     def set_board(self, coord, value):
         """
-        Marks a cell withy a given value ('X' for hit, 'O' for miss)
+        Marks a cell withy a given state (HIT or MISS)
         """
-        x, y = self.coord_to_indicies(coord)
-        if self.board[x, y] == '.':
-            self.board[x, y] = value
+        index = self.COORD_TO_FLAT[coord]
+        if self.board[index] == EMPTY:
+            self.board[index] = value
         else:
             print('Coordinate already shot')
         
@@ -52,21 +68,12 @@ class Battleship:
         """
         return self.hit_count >= 14
     
-    @classmethod
-    def coord_to_indicies(cls, coord):
-        """
-        Converts a coordinate string (e.g., 'C6') to board indicies
-        """
-        col = cls.ALPHABET.index(coord[0])
-        row = int(coord[1]) - 1
-        return col, row
-    
     @classmethod
     def is_valid_coord(cls, coord):
         """
         Validates the coordinate format
         """
-        return bool(cls.COORD_PATTERN.match(coord))
+        return coord in cls.VALID_COORDS
     
     def get_score(self):
         """
@@ -90,6 +97,12 @@ class Battleship:
     
 
 
+class ClientError(Exception):
+    """
+    Raised when the client cannot continue the game; the message is shown to the user
+    """
+
+
 class BattleshipClient:
     """
     Client class for connecting and playing the Battleship game
@@ -98,7 +111,9 @@ class BattleshipClient:
         self.host = host
         self.port = port
         self.game = Battleship()
-        self.client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.client = None # Socket to the server; created by connect()
+        self.rbuf = bytearray() # Data received from the server but not yet consumed as a message
+        self.recv_view = memoryview(bytearray(4096)) # Receive chunk reused by every recv_into call
 
         # The following are used in auto mode only (FOR TESTING -- not part of the assignment specs)
         self.auto = auto # If true, the client automatically fires shots
@@ -109,36 +124,60 @@ class BattleshipClient:
         """
         Attempts to onnect to the server at the given host and port
         """
+        self.client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
             self.client.connect((self.host, self.port))
+            # Disable Nagle's algorithm: each shot is a tiny message that must go out immediately
+            self.client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             print(f'Connected to {self.host}:{self.port}')
         except Exception as e:
-            print(f'Connection failed: {e}')
-            sys.exit(1)
+            self.client.close()
+            raise ClientError(f'Connection failed: {e}')
+
+    def receive_message(self):
+        """
+        Returns the next newline-terminated message from the server as bytes (including the newline).
+        Any extra data received in the same read is buffered for the next call, so messages
+        that arrive together or split across packets are handled correctly.
+        Returns empty bytes if the server closes the connection mid-message, or the unterminated
+        data if the server sends more than MAX_MESSAGE_LENGTH bytes without a newline.
+        """
+        end = self.rbuf.find(b'\n')
+        while end < 0:
+            if len(self.rbuf) > MAX_MESSAGE_LENGTH:
+                # No valid message is this long; hand it back so the caller rejects it
+                line = bytes(self.rbuf)
+                self.rbuf.clear()
+                return line
+            searched = len(self.rbuf) # Only newly received data needs to be searched
+            n = self.client.recv_into(self.recv_view)
+            if not n:
+                return b''
+            self.rbuf += self.recv_view[:n]
+            end = self.rbuf.find(b'\n', searched)
+        line = bytes(self.rbuf[:end + 1])
+        del self.rbuf[:end + 1]
+        return line
 
     def start_game(self):
         """
         Starts the game handshake with the server
         """
-        self.client.send(b'START GAME\n')
+        self.client.send(START_GAME_MSG)
 
         # Expect 'POSITIONING SHIPS' message
-        data = self.client.recv(20).decode()
-        data = data if data else 'null'
-        if data != 'POSITIONING SHIPS\n':
-            print('Error using socket. Closing connection...')
-            print(f'Invalid message from server. Expected POSITIONING SHIPS but received {data}')
-            self.client.close()
-            sys.exit(1)
+        data = self.receive_message()
+        data = data if data else b'null'
+        if data != POSITIONING_SHIPS_MSG:
+            raise ClientError('Error using socket. Closing connection...\n'
+                              f'Invalid message from server. Expected POSITIONING SHIPS but received {data.decode(errors="replace")}')
 
         # Expect 'SHIPS IN POSITION' message
-        data = self.client.recv(20).decode()
-        data = data if data else 'null'
-        if data != 'SHIPS IN POSITION\n':
-            print('Error using socket. Closing connection...')
-            print(f'Invalid message from server. Expected SHIPS IN POSITION but received {data}')
-            self.client.close()
-            sys.exit(1)
+        data = self.receive_message()
+        data = data if data else b'null'
+        if data != SHIPS_IN_POSITION_MSG:
+            raise ClientError('Error using socket. Closing connection...\n'
+                              f'Invalid message from server. Expected SHIPS IN POSITION but received {data.decode(errors="replace")}')
 
 
     def get_next_shot(self):
@@ -155,54 +194,48 @@ class BattleshipClient:
             return coord
         else:
             # Otherwise take input from the user
-            try:
-                return input('Enter coordinates to shoot: ').upper()
-            except KeyboardInterrupt:
-                self.client.close()
-                print()
-                sys.exit(1)
+            return input('Enter coordinates to shoot: ').upper()
         
     def play_turn(self, coord):
         """
         Sends a shot to the server ad updates the board based on the response
         """
         self.client.send(f'{coord}\n'.encode())
-        response = self.client.recv(20).decode()
+        response = self.receive_message()
 
-        if response == 'MISS\n':
-            self.game.set_board(coord, 'O')
-        elif response == 'HIT\n':
-            self.game.set_board(coord, 'X')
+        if response == MISS_MSG:
+            self.game.set_board(coord, MISS)
+        elif response == HIT_MSG:
+            self.game.set_board(coord, HIT)
             self.game.hit_count += 1
         else:
-            print(f'Error using socket. Closing connection...')
-            self.client.close()
-            sys.exit(1)
+            raise ClientError('Error using socket. Closing connection...')
 
 
     def play(self):
         """
-        Main gameplay loop: handles game progression
+        Main gameplay loop: handles game progression.
+        The socket is closed however the game ends, including on errors and Ctrl-C.
         """
         self.connect() # Connect to server
-        self.start_game() # Game handshake with server
+        with self.client:
+            self.start_game() # Game handshake with server
 
-        while not self.game.game_over():
-            print(self.game)
-            coord = self.get_next_shot()
+            while not self.game.game_over():
+                print(self.game)
+                coord = self.get_next_shot()
 
-            if not Battleship.is_valid_coord(coord):
-                print('Invalid Coordinates!\n')
-                continue
+                if not Battleship.is_valid_coord(coord):
+                    print('Invalid Coordinates!\n')
+                    continue
 
-            self.play_turn(coord)
+                self.play_turn(coord)
 
-        # After game over, validate final score
-        print(self.game)
-        final_score = int(self.client.recv(20).decode())
-        assert final_score == self.game.get_score()
-        print(f'You won! Final score: {final_score}\n')
-        self.client.close()
+            # After game over, validate final score
+            print(self.game)
+            final_score = int(self.receive_message())
+            assert final_score == self.game.get_score()
+            print(f'You won! Final score: {final_score}\n')
 
 
 
@@ -222,7 +255,18 @@ def main():
     args = parser.parse_args()
 
     client = BattleshipClient(host=args.host, port=args.port, auto=args.auto)
-    client.play()
+    try:
+        client.play()
+    except ClientError as e:
+        print(e)
+        sys.exit(1)
+    except ConnectionError as e:
+        print('Error using socket. Closing connection...')
+        print(e)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print()
+        sys.exit(1)
 
 
 if __name__ == '__main__':
@@ -1,112 +1,37 @@
+import asyncio
 import socket
-import numpy as np
 import argparse
-import re
+import logging
 import sys
 
+from battleship import Battleship
 
-class Battleship:
-    """
-    Class representing Battleship game board and game logic
-    """
-
-    GRID_SIZE = 9
-    ALPHABET = [chr(i) for i in range(65, 65 + GRID_SIZE)] # ['A', 'B', ...,'I']
-    COORD_PATTERN = re.compile(r'^[A-I][1-9]\n\Z')  # Valid coordinates: e.g., 'A1\n', 'E8\n'
-
-    def __init__(self):
-        self.board = np.zeros((self.GRID_SIZE, self.GRID_SIZE), dtype=int)
-        self.shot_count = 0  # Number of valid shots fired
-        self.hit_count = 0   # Number of successful hits
-        self.ships = {
-            'C': 5, # Canberra-class Landing Helicopter Dock
-            'H': 4, # Hobart-class Destroyer
-            'L': 3, # Leeuwin-class Survey Vessel
-            'A': 2  # Armidale-class Patrol Boat
-        }
-        assert self.GRID_SIZE >= max(self.ships.values()) # Grid too small for largest ship
-        self.position_ships()
-
-    def position_ships(self):
-        """
-        Randomnly position ships on board without overlapping
-        """
-        for size in self.ships.values():
-            while True:
-                x, y = np.random.randint(self.GRID_SIZE, size=2)
-                direction = np.random.choice(['H', 'V']) # Horizontal or vertical
-                if self.is_valid_placement(x, y, size, direction):
-                    self.set_ship(x, y, size, direction)
-                    break
-        
-    def is_valid_placement(self, x, y, size, direction):
-        """
-        Check if a ship can be placed at (x, y) in given direction without overlapping
-        """
-        if direction == 'H' and y + size <= self.GRID_SIZE:
-            return np.all(self.board[x, y:y+size] == 0)
-        elif direction == 'V' and x + size <= self.GRID_SIZE:
-            return np.all(self.board[x:x+size, y] == 0)
-        return False
-    
-    def set_ship(self, x, y, size, direction):
-        """
-        Place ship on board at (x, y) in given direction
-        """
-        if direction == 'H':
-            self.board[x, y:y+size] = 1
-        elif direction == 'V':
-            self.board[x:x+size, y] = 1
-        else:
-            raise ValueError("Direction must be 'H' or 'V'")
-        
-    def game_over(self):
-        """
-        Return True if all ships have been sunk
-        """
-        return self.hit_count == sum(self.ships.values())
+# Protocol messages, encoded once rather than on every send/compare
+START_GAME_MSG = b'START GAME\n'
+HANDSHAKE_MSG = b'POSITIONING SHIPS\nSHIPS IN POSITION\n' # Both handshake replies, sent together
+HIT_MSG = b'HIT\n'
+MISS_MSG = b'MISS\n'
+RESPONSES = (MISS_MSG, HIT_MSG) # Shot reply indexed by Battleship.fire()'s result (False/True)
 
+# Per-message traffic is logged at DEBUG (shown with --verbose); connection errors at WARNING
+logger = logging.getLogger(__name__)
 
-    def coord_to_indicies(self, coord):
-        """
-        Convert coordinate string (e.g., 'B7') into grid indices (x, y)
-        """
-        col = self.ALPHABET.index(coord[0])
-        row = int(coord[1]) - 1
-        return col, row
-    
 
-    def get_value_at(self, coord):
-        """
-        Return value at given coordinate
-        """
-        x, y = self.coord_to_indicies(coord)
-        return self.board[x, y]
-    
-    def set_value_at(self, coord, value):
-        """
-        Set value at given coordinate
-        """
-        x, y = self.coord_to_indicies(coord)
-        self.board[x, y] = value
-    
-    @classmethod
-    def is_valid_coord(cls, coord):
-        """
-        Check if coordinate string matches expected protocol
-        """
-        return bool(cls.COORD_PATTERN.match(coord))
-            
 class BattleshipServer:
     """
     Server for hosting Battleship games and communicating with client
     """
+
+    BACKLOG = 128 # Pending connections the kernel queues while the server is busy accepting
     
     def __init__(self, host='localhost', port=5050):
         """Initialise server socket and bind to host/port"""
         self.host = host
         self.port = port
+        self.game_pool = [] # Finished games kept for reuse by later clients (see get_game)
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Allow an immediate restart on the same port while old connections are still in TIME_WAIT
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         
         try:
             self.socket.bind((self.host, self.port))
@@ -115,82 +40,106 @@ class BattleshipServer:
             print('Address already in use')
             sys.exit(1)
 
-        self.socket.listen()
+        self.socket.listen(self.BACKLOG)
         print(f'Server listening on {self.host}:{self.port}')
 
 
-    def wait_for_client(self):
+    async def handle_client(self, reader, writer):
         """
-        Wait for client to connect and return the connection
+        Coroutine handling a single client connection; one runs per connected client.
+        The connection is always closed when the game ends, and socket errors (e.g., the
+        client disconnecting mid-write) only end this client's game, never the server.
         """
-        conn, _ = self.socket.accept()
-        return conn
-    
-        
-    def handle_client(self, conn):
-        """
-        Main loop for handling a single client connection. If the client at any point
-        sends an unexpected message to the server, the server will drop the connection and wait
-        for the next client to connect.
+        game = self.get_game()
+        try:
+            await self.play_game(reader, writer, game)
+        except (ConnectionError, ValueError) as e:
+            # ValueError: client sent a line longer than the stream reader's limit
+            logger.warning('Error communicating with client. Closing connection...')
+            logger.warning('%s', e)
+        finally:
+            self.game_pool.append(game)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass # Connection already torn down by the client
+
+    def get_game(self):
+        """
+        Return a freshly positioned game, reusing a finished one from the pool when available
+        """
+        if self.game_pool:
+            game = self.game_pool.pop()
+            game.reset()
+            return game
+        return Battleship()
+
+    async def play_game(self, reader, writer, game):
+        """
+        Play one game with a connected client. If the client at any point sends an
+        unexpected message to the server, the game ends and the connection is dropped
+        while other games carry on.
         """
-        game = Battleship()
-
         # Expect initial 'START GAME' message
-        data = conn.recv(30).decode()
-        print(f'Client: {data.strip()}')
-        if data != 'START GAME\n':
-            print('Error communicating with client. Closing connection...')
-            print(f'Invalid message from client. Expected START GAME but received: {data}')
-            conn.close()
+        data = await reader.readline()
+        logger.debug('Client: %s', data.decode(errors='replace').strip())
+        if data != START_GAME_MSG:
+            logger.warning('Error communicating with client. Closing connection...')
+            logger.warning('Invalid message from client. Expected START GAME but received: %s', data.decode(errors='replace').strip())
             return
         
-        # Acknowledge and start game
-        conn.send(b'POSITIONING SHIPS\n')
-        print('Server: POSITIONING SHIPS')
-        conn.send(b'SHIPS IN POSITION\n')
-        print('Server: SHIPS IN POSITION')
-
-        # Main game loop
-        while not game.game_over():
-            coord = conn.recv(20).decode()
-            coord = coord if coord else 'null'
-            print(f'Client: {coord.strip()}')
-
-            if not game.is_valid_coord(coord):
-                # Invalid coordinate, break and close the connection
-                print('Error communicating with client. Closing connection...')
-                print(f'Illegal Cell: {coord}')
-                break
-
-            if game.get_value_at(coord) == 1:
-                # Coordinate occupied by ship (x, y) == 1
-                print('Server: HIT')
-                conn.send(b'HIT\n')
-                game.set_value_at(coord, -1) # Mark cell as hit
-                game.hit_count += 1
-            else:
-                # Space empty: (x, y) == -1 (already hit) or 0 (empty)
-                print('Server: MISS')
-                conn.send(b'MISS\n')
-
-            # Track the number of shots
-            game.shot_count += 1
-
-        # Game over - send final shot count (i.e., score)
-        if game.game_over():
-            conn.send(f'{game.shot_count}'.encode())
-            print(f'Server: {game.shot_count}')
-
-        conn.close()
-        
+        # Acknowledge and start game (both messages go out in a single send)
+        writer.write(HANDSHAKE_MSG)
+        logger.debug('Server: POSITIONING SHIPS')
+        logger.debug('Server: SHIPS IN POSITION')
+        await writer.drain()
+
+        # Main game loop. Only a HIT can end the game, so game_over() is checked after each
+        # hit (which then returns) rather than before every shot
+        while True:
+            # Shots are validated and looked up as raw bytes; decoding is only needed for display
+            coord = await reader.readline()
+            coord = coord if coord else b'null'
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Client: %s', coord.decode(errors='replace').strip())
+
+            # One lookup both validates the shot and finds its cell
+            index = game.SHOT_TO_FLAT.get(coord)
+            if index is None:
+                # Invalid coordinate, end the game and close the connection
+                logger.warning('Error communicating with client. Closing connection...')
+                logger.warning('Illegal Cell: %s', coord.decode(errors='replace').strip())
+                return
+
+            # HIT if the cell holds a ship that had not been hit yet; MISS if empty or already hit
+            hit = game.fire(index)
+            logger.debug('Server: %s', 'HIT' if hit else 'MISS')
+
+            if hit and game.game_over():
+                # Game over - send final shot count (i.e., score) together with the last HIT
+                logger.debug('Server: %d', game.shot_count)
+                writer.writelines((HIT_MSG, f'{game.shot_count}\n'.encode()))
+                await writer.drain()
+                return
+
+            writer.write(RESPONSES[hit])
+            await writer.drain()
+
+
+    async def serve(self):
+        """
+        Accept clients on the bound socket and serve each one concurrently
+        """
+        server = await asyncio.start_server(self.handle_client, sock=self.socket, backlog=self.BACKLOG)
+        async with server:
+            await server.serve_forever()
 
     def run(self):
         """
         Run the server indefinitely
         """
-        while True:
-            conn = self.wait_for_client()
-            self.handle_client(conn)
+        asyncio.run(self.serve())
 
 
 
@@ -200,7 +149,12 @@ def main():
     """
     parser = argparse.ArgumentParser()
     parser.add_argument('port', type=int, nargs='?', default=5050, help='Server port')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Log every message sent and received')
     args = parser.parse_args()
+    # Log to stdout alongside the server's other output
+    logging.basicConfig(format='%(message)s', stream=sys.stdout)
+    # Only this module's logger is made verbose, so asyncio's own debug output stays hidden
+    logger.setLevel(logging.DEBUG if args.verbose else logging.WARNING)
 
     server = BattleshipServer(port=args.port)
     try:
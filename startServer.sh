@@ -1,4 +1,8 @@
-
 #!/bin/bash
 
-python3 ./src/server.py "$@"
\ No newline at end of file
+# Compile the server's game logic with Cython when it is installed (optional; plain Python is used otherwise)
+if python3 -c "import Cython" 2>/dev/null; then
+    python3 setup.py build_ext --inplace -q > /dev/null 2>&1 || echo 'Cython build failed; using pure Python game logic'
+fi
+
+python3 ./src/server.py "$@"